@@ -11,7 +11,6 @@ from typing import Dict, Any
 from config import Config
 from utils.logger import setup_logger
 from utils.task_manager import task_manager, TaskStatus
-from automation.google_search import perform_google_search
 from bdd_engine.generator import generate_bdd_test
 from bdd_engine.executor import execute_bdd_test
 from bdd_engine.auto_fixer import auto_fix_test
@@ -180,6 +179,8 @@ def search_sync():
         logger.info(f"Synchronous search request: {query}")
         
         # Perform search
+        from automation.google_search import perform_google_search
+        
         results = perform_google_search(query)
         
         return jsonify({
@@ -681,6 +682,8 @@ def _perform_search_async(task_id: str, query: str):
     try:
         task_manager.update_task_status(task_id, TaskStatus.RUNNING)
         
+        from automation.google_search import perform_google_search
+        
         results = perform_google_search(query)
         
         task_manager.update_task_status(
@@ -3,6 +3,7 @@ Google search automation using Playwright
 """
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from playwright.sync_api import sync_playwright, Browser, Page, BrowserContext
@@ -12,6 +13,16 @@ from automation.auth_handler import AuthHandler
 
 logger = setup_logger(__name__)
 
+# Writes screenshot files in the background so capture does not block on disk I/O
+_screenshot_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='screenshot-writer')
+
+
+def _write_screenshot(filepath: str, data: bytes):
+    """Write captured screenshot bytes to disk"""
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    logger.info(f"Screenshot saved: {filepath}")
+
 
 class GoogleSearchAutomation:
     """Automates Google search using Playwright"""
@@ -23,6 +34,7 @@ class GoogleSearchAutomation:
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.auth_handler = AuthHandler()
+        self._pending_screenshots: List[Future] = []
         Config.ensure_directories()
         logger.info("GoogleSearchAutomation initialized")
     
@@ -127,8 +139,17 @@ class GoogleSearchAutomation:
             logger.error(f"Error starting browser: {str(e)}")
             raise
     
+    def flush_screenshots(self):
+        """Wait for pending screenshot writes to finish"""
+        done, _ = wait(self._pending_screenshots)
+        self._pending_screenshots = []
+        for future in done:
+            if future.exception():
+                logger.error(f"Error writing screenshot: {str(future.exception())}")
+    
     def stop_browser(self):
         """Stop Playwright browser"""
+        self.flush_screenshots()
         try:
             if self.page:
                 self.page.close()
@@ -157,8 +178,10 @@ class GoogleSearchAutomation:
             filename = f"{name}_{timestamp}.png"
             filepath = os.path.join(Config.SCREENSHOTS_DIR, filename)
             
-            self.page.screenshot(path=filepath, full_page=True)
-            logger.info(f"Screenshot saved: {filepath}")
+            data = self.page.screenshot(full_page=True)
+            self._pending_screenshots.append(
+                _screenshot_writer.submit(_write_screenshot, filepath, data)
+            )
             return filepath
             
         except Exception as e:
@@ -226,8 +249,7 @@ class GoogleSearchAutomation:
             
             # Wait for results to load
             logger.info("Waiting for search results...")
-            self.page.wait_for_load_state('networkidle', timeout=15000)
-            time.sleep(random.uniform(2.0, 3.5))  # Random wait for dynamic content
+            self.page.wait_for_selector('#search, #rso', timeout=15000)
             
             # Take screenshot of search results
             screenshot2 = self.take_screenshot("search_results")
@@ -4,10 +4,12 @@ Executes JSON-based test specifications in real-time
 """
 import os
 import json
+import random
 import asyncio
+from collections import Counter
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Error as PlaywrightError
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Locator, Error as PlaywrightError
 from utils.logger import setup_logger
 from config import Config
 
@@ -17,6 +19,17 @@ logger = setup_logger(__name__)
 class PlaywrightAmazonExecutor:
     """Execute Amazon test scenarios using Playwright"""
     
+    # Scenario wait policy -> page.goto wait_until for Given navigation
+    WAIT_POLICIES = {
+        'minimal': 'commit',
+        'dom': 'domcontentloaded',
+        'load': 'load'
+    }
+    
+    # Navigation retry backoff (seconds)
+    RETRY_BACKOFF_BASE = 0.5
+    RETRY_BACKOFF_CAP = 8.0
+    
     def __init__(self):
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -24,6 +37,8 @@ class PlaywrightAmazonExecutor:
         self.playwright = None
         self.test_results = []
         self.browser_crashed = False
+        # Locator handles keyed by selector, reset for every scenario
+        self._locator_cache: Dict[str, Locator] = {}
         
     async def initialize_browser(self, config: Dict[str, Any]):
         """Initialize Playwright browser"""
@@ -72,6 +87,13 @@ class PlaywrightAmazonExecutor:
                     '--disable-blink-features=AutomationControlled'
                 ])
                 
+                # Opt-in QUIC for lower per-request latency. Playwright already runs
+                # the network service in-process, and a second --enable-features or
+                # --disable-features switch would replace its own feature lists.
+                if config.get('fast_network', False):
+                    launch_args.append('--enable-quic')
+                    logger.info("fast_network enabled: using QUIC")
+                
                 self.browser = await self.playwright.chromium.launch(
                     headless=headless,
                     args=launch_args
@@ -224,9 +246,23 @@ class PlaywrightAmazonExecutor:
         if self.page.is_closed():
             return False, "Page is closed"
         return True, "OK"
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Jittered exponential backoff delay before retrying attempt + 1"""
+        delay = min(self.RETRY_BACKOFF_CAP, self.RETRY_BACKOFF_BASE * (2 ** attempt))
+        return delay * (1 + random.random() * 0.1)
+    
+    def _get_locator(self, selector: str) -> Locator:
+        """Get a cached locator for selector, creating it on first use"""
+        locator = self._locator_cache.get(selector)
+        if locator is None:
+            locator = self.page.locator(selector)
+            self._locator_cache[selector] = locator
+        return locator
             
     async def close_browser(self):
         """Close browser and cleanup"""
+        self._locator_cache.clear()
         try:
             # Close page if it exists and is not closed
             if self.page:
@@ -319,7 +355,7 @@ class PlaywrightAmazonExecutor:
                                 raise  # Don't retry on browser close
                             logger.warning(f"Navigation attempt {attempt + 1} failed: {error_msg}")
                             if attempt < max_retries - 1:
-                                await asyncio.sleep(2)  # Wait 2 seconds before retry
+                                await asyncio.sleep(self._retry_delay(attempt))
                             else:
                                 result['status'] = 'failed'
                                 result['error'] = str(last_error)
@@ -330,7 +366,7 @@ class PlaywrightAmazonExecutor:
                             last_error = e
                             logger.warning(f"Navigation attempt {attempt + 1} failed: {str(e)}")
                             if attempt < max_retries - 1:
-                                await asyncio.sleep(2)  # Wait 2 seconds before retry
+                                await asyncio.sleep(self._retry_delay(attempt))
                             else:
                                 # All retries failed
                                 result['status'] = 'failed'
@@ -391,7 +427,7 @@ class PlaywrightAmazonExecutor:
                     locator = element.get('locator')
                     
                     if locator:
-                        count = await self.page.locator(locator).count()
+                        count = await self._get_locator(locator).count()
                         if count > 0:
                             result['status'] = 'passed'
                             result['message'] = f"Element {locator} exists (count: {count})"
@@ -402,7 +438,7 @@ class PlaywrightAmazonExecutor:
                 elif validation_type == 'cart_items_count':
                     expected = step.get('expected_result')
                     # Get cart count from page
-                    cart_count_element = await self.page.locator('#nav-cart-count').text_content()
+                    cart_count_element = await self._get_locator('#nav-cart-count').text_content()
                     cart_count = int(cart_count_element) if cart_count_element else 0
                     
                     if expected == 'greater_than_0':
@@ -426,7 +462,7 @@ class PlaywrightAmazonExecutor:
                     expected_text = step.get('expected_text')
                     
                     if locator and expected_text:
-                        actual_text = await self.page.locator(locator).text_content()
+                        actual_text = await self._get_locator(locator).text_content()
                         if expected_text in actual_text:
                             result['status'] = 'passed'
                             result['message'] = f"Text matches: {expected_text}"
@@ -480,16 +516,41 @@ class PlaywrightAmazonExecutor:
             
         return result
         
+    def _resolve_wait_policy(self, scenario: Dict[str, Any]) -> str:
+        """
+        Resolve how long Given navigation should wait for the page
+        
+        Scenarios whose only validations are url_contains checks never touch
+        the DOM, so navigation can return as soon as the response commits.
+        """
+        policy = scenario.get('wait_policy')
+        if policy in self.WAIT_POLICIES:
+            return policy
+        
+        then_steps = scenario.get('then', [])
+        if scenario.get('when') or not then_steps:
+            return 'dom'
+        
+        if all(step.get('validation_type') == 'url_contains' and 'action' not in step
+               for step in then_steps):
+            return 'minimal'
+        return 'dom'
+        
     async def execute_scenario(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single scenario"""
+        wait_policy = self._resolve_wait_policy(scenario)
+        wait_until = self.WAIT_POLICIES[wait_policy]
+        
         scenario_result = {
             'scenario_id': scenario.get('scenario_id'),
             'scenario_name': scenario.get('scenario_name'),
             'tags': scenario.get('tags', []),
+            'wait_policy': wait_policy,
             'status': 'pending',
             'steps': [],
             'start_time': datetime.now().isoformat()
         }
+        self._locator_cache.clear()
         
         try:
             # Check if browser is still connected before starting
@@ -500,6 +561,8 @@ class PlaywrightAmazonExecutor:
             
             # Execute Given steps
             for step in scenario.get('given', []):
+                if 'url' in step and 'wait_until' not in step:
+                    step = {**step, 'wait_until': wait_until}
                 step_result = await self.execute_step(step, 'given')
                 scenario_result['steps'].append(step_result)
                 if step_result['status'] == 'failed':
@@ -567,8 +630,9 @@ class PlaywrightAmazonExecutor:
                 test_result['scenarios'].append(scenario_result)
                 
             # Determine overall status
-            passed = sum(1 for s in test_result['scenarios'] if s['status'] == 'passed')
-            failed = sum(1 for s in test_result['scenarios'] if s['status'] == 'failed')
+            status_counts = Counter(s['status'] for s in test_result['scenarios'])
+            passed = status_counts['passed']
+            failed = status_counts['failed']
             total = len(test_result['scenarios'])
             
             test_result['summary'] = {
@@ -14,6 +14,10 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Lines that only appear in YAML specs: list items or lowercase "key:" mappings
+# (Gherkin keywords such as "Scenario:" are capitalized)
+YAML_STRUCTURE_PATTERN = re.compile(r'^\s*(?:-\s|[a-z_]+:)', re.MULTILINE)
+
 
 class EnhancedBDDGenerator:
     """Enhanced BDD generator with dynamic Gherkin template support"""
@@ -233,18 +237,22 @@ class EnhancedBDDGenerator:
                 # Try to detect YAML format
                 if specification.strip().startswith('feature:') or specification.strip().startswith('Feature:'):
                     # Could be YAML or natural language
-                    try:
-                        # Try parsing as YAML first
-                        yaml_data = yaml.safe_load(specification)
-                        if isinstance(yaml_data, dict):
-                            logger.info("Detected YAML format")
-                            parsed = self.parse_structured_spec(yaml_data)
-                        else:
-                            # Not valid YAML dict, try natural language
-                            parsed = self.parse_natural_language(specification)
-                    except yaml.YAMLError:
-                        # Not valid YAML, try natural language
+                    if not YAML_STRUCTURE_PATTERN.search(specification):
+                        # No YAML structure, skip the YAML parser entirely
                         parsed = self.parse_natural_language(specification)
+                    else:
+                        try:
+                            # Try parsing as YAML first
+                            yaml_data = yaml.safe_load(specification)
+                            if isinstance(yaml_data, dict):
+                                logger.info("Detected YAML format")
+                                parsed = self.parse_structured_spec(yaml_data)
+                            else:
+                                # Not valid YAML dict, try natural language
+                                parsed = self.parse_natural_language(specification)
+                        except yaml.YAMLError:
+                            # Not valid YAML, try natural language
+                            parsed = self.parse_natural_language(specification)
                 elif 'Feature:' in specification or 'Scenario:' in specification:
                     # Natural language Gherkin format
                     parsed = self.parse_natural_language(specification)
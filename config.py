@@ -53,6 +53,12 @@ class Config:
 
     # Database Configuration
     DATABASE_URL = os.getenv('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        'pool_pre_ping': True,  # Drop connections closed by the server/pooler
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 600)),  # Seconds
+    }
     
     @classmethod
     def get_database_url(cls):
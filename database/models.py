@@ -40,7 +40,7 @@ class TestExecution(Base):
     response_status = Column(String(20), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     start_time = Column(DateTime, nullable=True)
     end_time = Column(DateTime, nullable=True)
@@ -74,7 +74,7 @@ from config import Config
 DATABASE_URL = Config.get_database_url()
 
 if DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **Config.SQLALCHEMY_ENGINE_OPTIONS)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
     # Create tables
@@ -2,23 +2,30 @@
 Gunicorn configuration file for GAF API
 Production-ready settings for Flask application
 """
-import multiprocessing
 import os
+import resource
+import sys
 
 # Server socket
 bind = "0.0.0.0:5001"
 backlog = 2048
 
 # Worker processes
-workers = 3  # Fixed worker count
-worker_class = "sync"
+# Conservative default: every worker may run Chromium and holds its own DB pool
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW connections); raise with WEB_CONCURRENCY
+workers = int(os.getenv("WEB_CONCURRENCY", 3))
+worker_class = "gthread"  # Threads keep serving while Playwright/DB calls block on I/O
+threads = 8
 worker_connections = 1000
-timeout = 120  # Increased for long-running Playwright tests
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None  # Heartbeat files in RAM
+# With gthread the heartbeat comes from the worker's main loop, so this only
+# restarts a worker whose main loop stalls; it does not cut off a slow request.
+# Per-request limits come from Playwright and requests timeouts.
+timeout = 120
 keepalive = 5
 
-# Restart workers after this many requests to prevent memory leaks
-max_requests = 1000
-max_requests_jitter = 50
+# Restart a worker only once its peak memory exceeds this limit (see pre_request)
+MAX_WORKER_MEMORY_MB = int(os.getenv("MAX_WORKER_MEMORY_MB", 500))
 
 # Logging
 accesslog = "logs/access.log"
@@ -54,6 +61,26 @@ def when_ready(server):
     """Called just after the server is started."""
     print(f"Gunicorn server is ready. Listening on {bind}")
 
+def pre_request(worker, req):
+    """Called just before a worker processes the request."""
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    if worker.alive and rss_mb > MAX_WORKER_MEMORY_MB:
+        worker.log.warning(
+            f"Worker {worker.pid} peak memory {rss_mb:.0f}MB exceeds "
+            f"{MAX_WORKER_MEMORY_MB}MB, restarting after this request"
+        )
+        worker.alive = False
+
+def post_fork(server, worker):
+    """Called just after a worker has been forked."""
+    # preload_app imports the database module in the master; drop the
+    # inherited pool so each worker opens its own connections
+    from database.models import engine
+    if engine is not None:
+        engine.dispose(close=False)
+
 def on_exit(server):
     """Called just before exiting Gunicorn."""
     print("Shutting down Gunicorn server...")
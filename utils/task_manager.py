@@ -4,11 +4,34 @@ Task manager for handling async operations
 import uuid
 import json
 import os
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
 from enum import Enum
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TaskStatus(Enum):
     """Task status enumeration"""
@@ -18,12 +41,73 @@ class TaskStatus(Enum):
     FAILED = "failed"
 
 
+# Precomputed status strings for the task update path
+_STATUS_VALUE = {status: status.value for status in TaskStatus}
+_PENDING = TaskStatus.PENDING.value
+
+# Statuses after which a task no longer changes
+TERMINAL_STATUSES = {TaskStatus.COMPLETED.value, TaskStatus.FAILED.value}
+
+_TASK_COLUMNS = ('id', 'type', 'status', 'created_at', 'updated_at', 'data', 'result', 'error')
+
+_CREATE_TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data BLOB,
+    result BLOB,
+    error TEXT
+)
+"""
+
+
 class TaskManager:
     """Manages async tasks and their results"""
     
     def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
-        Config.ensure_directories()
+        # LRU cache of tasks owned by this process, plus finished tasks read
+        # from the store; evicted tasks are reloaded from the store on demand
+        self.tasks: Dict[str, Dict[str, Any]] = OrderedDict()
+        self._cap = 1024
+        self._lock = threading.RLock()
+        self._db_path = os.path.join(Config.RESULTS_DIR, 'tasks.db')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        atexit.register(self.close)
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get the SQLite connection for the current process
+        
+        Opened lazily and reopened after a fork, since Gunicorn preloads the
+        app in the master and SQLite connections must not cross processes.
+        The results directory is only created here, on first use.
+        Callers must hold self._lock.
+        """
+        if self._conn is None or self._conn_pid != os.getpid():
+            Config.ensure_directories()
+            conn = sqlite3.connect(self._db_path, timeout=30,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(_CREATE_TASKS_TABLE)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+    
+    def _cache_task(self, task_id: str, task: Dict[str, Any]):
+        """
+        Add task to the in-memory cache, evicting the least recently used
+        
+        Callers must hold self._lock.
+        """
+        self.tasks[task_id] = task
+        self.tasks.move_to_end(task_id)
+        if len(self.tasks) > self._cap:
+            self.tasks.popitem(last=False)
     
     def create_task(self, task_type: str, data: Optional[Dict] = None) -> str:
         """
@@ -37,17 +121,20 @@ class TaskManager:
             Task ID
         """
         task_id = str(uuid.uuid4())
-        self.tasks[task_id] = {
+        now = datetime.now().isoformat()
+        task = {
             'id': task_id,
             'type': task_type,
-            'status': TaskStatus.PENDING.value,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-            'data': data or {},
+            'status': _PENDING,
+            'created_at': now,
+            'updated_at': now,
+            'data': {} if data is None else data,
             'result': None,
             'error': None
         }
-        self._save_task(task_id)
+        with self._lock:
+            self._cache_task(task_id, task)
+            self._save_task(task_id)
         return task_id
     
     def update_task_status(self, task_id: str, status: TaskStatus, 
@@ -62,19 +149,21 @@ class TaskManager:
             result: Task result (if completed)
             error: Error message (if failed)
         """
-        if task_id not in self.tasks:
-            raise ValueError(f"Task {task_id} not found")
-        
-        self.tasks[task_id]['status'] = status.value
-        self.tasks[task_id]['updated_at'] = datetime.now().isoformat()
-        
-        if result is not None:
-            self.tasks[task_id]['result'] = result
-        
-        if error is not None:
-            self.tasks[task_id]['error'] = error
-        
-        self._save_task(task_id)
+        with self._lock:
+            if task_id not in self.tasks and not self.load_task(task_id):
+                raise ValueError(f"Task {task_id} not found")
+            
+            task = self.tasks[task_id]
+            task['status'] = _STATUS_VALUE[status]
+            task['updated_at'] = datetime.now().isoformat()
+            
+            if result is not None:
+                task['result'] = result
+            
+            if error is not None:
+                task['error'] = error
+            
+            self._save_task(task_id)
     
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -87,12 +176,19 @@ class TaskManager:
             Task data or None
         """
         # First check in-memory cache
-        if task_id in self.tasks:
-            return self.tasks[task_id]
+        with self._lock:
+            if task_id in self.tasks:
+                self.tasks.move_to_end(task_id)
+                return self.tasks[task_id]
         
-        # If not in memory, try to load from file
-        if self.load_task(task_id):
-            return self.tasks.get(task_id)
+        # If not in memory, try the task store; only finished tasks are
+        # cached since another worker may still be updating the rest
+        task = self._read_task(task_id)
+        if task:
+            if task['status'] in TERMINAL_STATUSES:
+                with self._lock:
+                    self._cache_task(task_id, task)
+            return task
         
         # If not in file, try to load from database
         try:
@@ -113,8 +209,10 @@ class TaskManager:
                     'result': db_task.get('result'),
                     'error': db_task.get('error')
                 }
-                # Cache it in memory
-                self.tasks[task_id] = task_data
+                # Cache it in memory once finished
+                if task_data['status'] in TERMINAL_STATUSES:
+                    with self._lock:
+                        self._cache_task(task_id, task_data)
                 return task_data
         except Exception as e:
             # If database lookup fails, just return None
@@ -150,18 +248,100 @@ class TaskManager:
     
     def _save_task(self, task_id: str):
         """
-        Save task to file
+        Save task to the task store
+        
+        Callers must hold self._lock.
+        
+        Args:
+            task_id: Task ID
+        """
+        self._write_task(self.tasks[task_id])
+    
+    def _write_task(self, task: Dict[str, Any]):
+        """
+        Insert or replace a task row in the task store
+        
+        Callers must hold self._lock.
+        
+        Args:
+            task: Task data
+        """
+        row = (
+            task['id'],
+            task.get('type'),
+            task.get('status'),
+            task.get('created_at'),
+            task.get('updated_at'),
+            _dumps(task.get('data') or {}),
+            _dumps(task['result']) if task.get('result') is not None else None,
+            task.get('error'),
+        )
+        self._get_conn().execute(
+            f"INSERT OR REPLACE INTO tasks ({', '.join(_TASK_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_TASK_COLUMNS))})",
+            row
+        )
+    
+    def _read_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read task from the task store
+        
+        Args:
+            task_id: Task ID
+            
+        Returns:
+            Task data or None
+        """
+        with self._lock:
+            row = self._get_conn().execute(
+                f"SELECT {', '.join(_TASK_COLUMNS)} FROM tasks WHERE id = ?",
+                (task_id,)
+            ).fetchone()
+        if row is None:
+            return self._import_legacy_task(task_id)
+        
+        task = dict(zip(_TASK_COLUMNS, row))
+        task['data'] = _loads(task['data'])
+        task['result'] = _loads(task['result']) if task['result'] is not None else None
+        return task
+    
+    def _import_legacy_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Import a task saved as results/<task_id>.json before the task store
+        
+        The task is copied into the store, so the file is only read once.
         
         Args:
             task_id: Task ID
+            
+        Returns:
+            Task data or None
         """
+        if os.path.basename(task_id) != task_id:
+            return None
+        
         task_file = os.path.join(Config.RESULTS_DIR, f'{task_id}.json')
-        with open(task_file, 'w') as f:
-            json.dump(self.tasks[task_id], f, indent=2)
+        if not os.path.exists(task_file):
+            return None
+        
+        try:
+            with open(task_file, 'rb') as f:
+                task = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(task, dict) or task.get('id') != task_id:
+            return None
+        
+        task.setdefault('data', {})
+        task.setdefault('result', None)
+        task.setdefault('error', None)
+        with self._lock:
+            self._write_task(task)
+        return task
     
     def load_task(self, task_id: str) -> bool:
         """
-        Load task from file
+        Load task from the task store into memory
         
         Args:
             task_id: Task ID
@@ -169,12 +349,20 @@ class TaskManager:
         Returns:
             True if loaded successfully
         """
-        task_file = os.path.join(Config.RESULTS_DIR, f'{task_id}.json')
-        if os.path.exists(task_file):
-            with open(task_file, 'r') as f:
-                self.tasks[task_id] = json.load(f)
-            return True
-        return False
+        task = self._read_task(task_id)
+        if task is None:
+            return False
+        with self._lock:
+            self._cache_task(task_id, task)
+        return True
+    
+    def close(self):
+        """Close this process's task store connection"""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
 
 
 # Global task manager instance